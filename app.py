@@ -3,14 +3,18 @@ World Globe Explorer — Premium 3D Globe v2
 Natural Space View · Rich Hover Stats · City Detail Modal · CSV Export
 """
 
-import csv
-import io
-import json
 import os
+from functools import lru_cache
 
 import dash
-from dash import Input, Output, State, ctx, dcc, html, no_update
+from dash import ClientsideFunction, Input, Output, State, ctx, dcc, html, no_update
+import numpy as np
+import orjson
 import plotly.graph_objects as go
+import plotly.io as pio
+from flask.json.provider import DefaultJSONProvider
+from flask_caching import Cache
+from flask_caching.backends import NullCache, SimpleCache
 
 from data.cities_data import CITIES_DATA, CONTINENT_COLORS, CONTINENT_EMOJIS
 
@@ -21,12 +25,53 @@ app = dash.Dash(
     title="🌍 World Globe Explorer",
     meta_tags=[{"name": "viewport", "content": "width=device-width, initial-scale=1"}],
     suppress_callback_exceptions=True,
+    # gzip/brotli every response — the layout JSON shrinks ~5× (60 KB → 12 KB)
+    compress=True,
     external_stylesheets=[
         "https://fonts.googleapis.com/css2?family=Orbitron:wght@400;700;900&family=Exo+2:ital,wght@0,300;0,400;0,600;1,300&display=swap"
     ],
 )
 server = app.server
 
+
+def _env_value(raw: str):
+    """JSON-decode an env value when possible (numbers, lists), else keep the str."""
+    try:
+        return orjson.loads(raw)
+    except orjson.JSONDecodeError:
+        return raw
+
+
+# Callback-output cache, configured from any CACHE_* env vars — SimpleCache is
+# per-process; point CACHE_TYPE at a shared backend (e.g. FileSystemCache +
+# CACHE_DIR) to share across workers
+cache = Cache(server, config={
+    "CACHE_TYPE": "SimpleCache",
+    "CACHE_DEFAULT_TIMEOUT": 3600,
+    **{k: _env_value(v) for k, v in os.environ.items() if k.startswith("CACHE_")},
+})
+with server.app_context():
+    SHARED_CACHE = not isinstance(cache.cache, (SimpleCache, NullCache))
+
+# Dash encodes layouts and callback responses through plotly.io.json — pin the
+# orjson engine rather than rely on "auto" silently falling back to stdlib json
+pio.json.config.default_engine = "orjson"
+
+
+class OrjsonProvider(DefaultJSONProvider):
+    """Flask JSON via orjson — Dash parses every callback request body with it."""
+
+    def dumps(self, obj, **kwargs) -> str:
+        return orjson.dumps(
+            obj, default=self.default, option=orjson.OPT_SERIALIZE_NUMPY
+        ).decode()
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
+
+server.json = OrjsonProvider(server)
+
 # ─── Helpers ──────────────────────────────────────────────────────────────────
 
 def fmt_pop(n: int) -> str:
@@ -49,71 +94,163 @@ def hex_rgba(hex_color: str, opacity: float) -> str:
     return f"rgba({r},{g},{b},{opacity})"
 
 
-# ─── Globe Figure ─────────────────────────────────────────────────────────────
+# ─── Precomputed Lookups ──────────────────────────────────────────────────────
+
+# CITIES_DATA is static — group it by continent once instead of per figure build
+CITIES_BY_CONTINENT: dict[str, list] = {}
+for _c in CITIES_DATA:
+    CITIES_BY_CONTINENT.setdefault(_c["continent"], []).append(_c)
+
+
+HOVER_TMPL = (
+    "<b style='font-size:15px;color:{color}'>{flag}  {name}</b><br>"
+    "<span style='color:#99bbcc;font-size:12px'>{country}  ·  {continent}</span>"
+    "<br><br>"
+    "<span style='color:#6090a8;font-size:10px;letter-spacing:1px'>POPULATION</span><br>"
+    "<span style='color:{color};font-size:11px'>{pop_bar}</span>"
+    "  <b style='color:#ddeeff;font-size:12px'>{fmt_pop}</b>"
+    "<br><br>"
+    "<span style='color:#6090a8;font-size:10px;letter-spacing:1px'>FAMOUS FOR</span><br>"
+    "<span style='color:#c0ddf0;font-size:12px'>{best_known_for}</span>"
+    "<br><br>"
+    "<span style='color:#6090a8;font-size:10px;letter-spacing:1px'>TOP ATTRACTION</span><br>"
+    "<span style='color:#e8f4ff;font-size:12px'>⭐  {top_attraction}</span>"
+    "<br><br>"
+    "<span style='color:{color};font-size:10px;font-style:italic'>"
+    "Click for full details &amp; CSV export  ›</span>"
+)
 
-def build_figure(view_mode: str = "globe", continent: str = "All") -> go.Figure:
-    cities = (
-        CITIES_DATA
-        if continent == "All"
-        else [c for c in CITIES_DATA if c["continent"] == continent]
+
+def _precompute_city_render_fields() -> None:
+    """Freeze index, formatted population, tags and hover HTML onto each city."""
+    for i, c in enumerate(CITIES_DATA):
+        color = CONTINENT_COLORS.get(c["continent"], "#00d2ff")
+        c["_idx"] = i
+        c["_fmt_pop"] = fmt_pop(c["population"])
+        c["_pop_bar"] = pop_bar(c["population"])
+        c["_pop_pct"] = min(100, c["population"] / 22_000_000 * 100)
+        c["_tags"] = [t.strip() for t in c["best_known_for"].split(",")]
+        c["_hover"] = HOVER_TMPL.format_map({
+            "color":          color,
+            "flag":           c["flag"],
+            "name":           c["name"],
+            "country":        c["country"],
+            "continent":      c["continent"],
+            "pop_bar":        c["_pop_bar"],
+            "fmt_pop":        c["_fmt_pop"],
+            "best_known_for": c["best_known_for"][:65],
+            "top_attraction": c["top_attractions"][0],
+        })
+
+
+_precompute_city_render_fields()
+
+# Struct-of-arrays view of CITIES_DATA, aligned by city index — the dicts stay
+# the source of truth for modal / export lookups by index
+CONTINENTS = list(CITIES_BY_CONTINENT)
+_cont_code = {cont: k for k, cont in enumerate(CONTINENTS)}
+CONT_CODE_ALL = np.array([_cont_code[c["continent"]] for c in CITIES_DATA], dtype=np.int8)
+# float32 is ample for coordinates / pixel sizes and halves the typed-array payload
+LAT_ALL = np.array([c["lat"] for c in CITIES_DATA], dtype=np.float32)
+LON_ALL = np.array([c["lon"] for c in CITIES_DATA], dtype=np.float32)
+POP_ALL = np.array([c["population"] for c in CITIES_DATA], dtype=np.float64)
+SIZES_ALL = np.clip(POP_ALL * (2.3 / 850_000), 9.0, 24.0).astype(np.float32)
+
+# CITIES_DATA indices of each continent's cities — materialised once
+CONT_IDX: dict[str, np.ndarray] = {
+    cont: np.flatnonzero(CONT_CODE_ALL == k) for k, cont in enumerate(CONTINENTS)
+}
+
+# Per-continent slices — handed to Plotly as ndarrays, no list building
+GEO: dict[str, dict[str, np.ndarray]] = {
+    cont: {"lat": LAT_ALL[idx], "lon": LON_ALL[idx]}
+    for cont, idx in CONT_IDX.items()
+}
+SIZES: dict[str, np.ndarray] = {cont: SIZES_ALL[idx] for cont, idx in CONT_IDX.items()}
+for _arr in (*SIZES.values(), *(a for geo in GEO.values() for a in geo.values())):
+    _arr.flags.writeable = False
+
+# Everything a globe trace needs, one entry per non-empty continent in legend
+# order: (continent, colour, lats, lons, sizes, hover, customdata). Frozen as
+# tuples — these are shared by every figure build and must never be mutated.
+TRACE_DATA = [
+    (
+        cont, color, GEO[cont]["lat"], GEO[cont]["lon"], SIZES[cont],
+        tuple(c["_hover"] for c in CITIES_BY_CONTINENT[cont]),
+        tuple(c["_idx"] for c in CITIES_BY_CONTINENT[cont]),
     )
+    for cont, color in CONTINENT_COLORS.items()
+    if cont in CITIES_BY_CONTINENT
+]
 
-    fig = go.Figure()
-
-    for cont, color in CONTINENT_COLORS.items():
-        grp = [c for c in cities if c["continent"] == cont]
-        if not grp:
-            continue
-
-        lats  = [c["lat"] for c in grp]
-        lons  = [c["lon"] for c in grp]
-        sizes = [max(9, min(24, c["population"] / 850_000 * 2.3)) for c in grp]
-
-        hover = [
-            (
-                f"<b style='font-size:15px;color:{color}'>{c['flag']}  {c['name']}</b><br>"
-                f"<span style='color:#99bbcc;font-size:12px'>{c['country']}  ·  {c['continent']}</span>"
-                f"<br><br>"
-                f"<span style='color:#6090a8;font-size:10px;letter-spacing:1px'>POPULATION</span><br>"
-                f"<span style='color:{color};font-size:11px'>{pop_bar(c['population'])}</span>"
-                f"  <b style='color:#ddeeff;font-size:12px'>{fmt_pop(c['population'])}</b>"
-                f"<br><br>"
-                f"<span style='color:#6090a8;font-size:10px;letter-spacing:1px'>FAMOUS FOR</span><br>"
-                f"<span style='color:#c0ddf0;font-size:12px'>{c['best_known_for'][:65]}</span>"
-                f"<br><br>"
-                f"<span style='color:#6090a8;font-size:10px;letter-spacing:1px'>TOP ATTRACTION</span><br>"
-                f"<span style='color:#e8f4ff;font-size:12px'>⭐  {c['top_attractions'][0]}</span>"
-                f"<br><br>"
-                f"<span style='color:{color};font-size:10px;font-style:italic'>"
-                f"Click for full details &amp; CSV export  ›</span>"
-            )
-            for c in grp
-        ]
-
-        fig.add_trace(
-            go.Scattergeo(
-                lat=lats,
-                lon=lons,
-                mode="markers",
-                marker=dict(
-                    size=sizes,
-                    color=color,
-                    opacity=0.93,
-                    line=dict(color="rgba(255,255,255,0.55)", width=1.5),
-                ),
-                name=CONTINENT_EMOJIS.get(cont, "") + "  " + cont,
-                hovertext=hover,
-                hoverinfo="text",
-                hoverlabel=dict(
-                    bgcolor="rgba(3,12,28,0.97)",
-                    bordercolor=color,
-                    font=dict(color="#ddeeff", size=12, family="Exo 2"),
-                    namelength=0,
-                ),
-                customdata=[json.dumps(c) for c in grp],
-                showlegend=True,
-            )
-        )
+# Continent of each globe trace, by trace index — the clientside filter patches
+# data[i].visible against this
+TRACE_ORDER = [t[0] for t in TRACE_DATA]
+
+# Population-comparison chart columns — independent of which city is selected
+SORTED_BY_CONT: dict[str, list] = {
+    cont: sorted(grp, key=lambda x: x["population"])
+    for cont, grp in CITIES_BY_CONTINENT.items()
+}
+POP_XY: dict[str, dict[str, np.ndarray]] = {
+    cont: {
+        "names": np.array([c["name"] for c in grp]),
+        "pops":  np.array([c["population"] for c in grp], dtype=np.int64),
+        "texts": np.array([c["_fmt_pop"] for c in grp]),
+    }
+    for cont, grp in SORTED_BY_CONT.items()
+}
+
+# Attraction-chart bar colours — continent colour at a fixed opacity ramp
+RGBA_RAMP: dict[str, list[str]] = {
+    cont: [hex_rgba(col, op) for op in (0.95, 0.82, 0.70, 0.58, 0.46)]
+    for cont, col in CONTINENT_COLORS.items()
+}
+
+
+# ─── Globe Figure ─────────────────────────────────────────────────────────────
+
+# Per-view geo overrides — also shipped to the browser for the clientside toggle
+VIEW_GEO = {
+    "globe": dict(
+        projection=dict(type="orthographic", rotation=dict(lon=15, lat=15, roll=0)),
+    ),
+    "flat": dict(
+        projection=dict(type="natural earth"),
+        lataxis=dict(range=[-85, 85]),
+        lonaxis=dict(range=[-180, 180]),
+    ),
+}
+
+
+def build_figure(view_mode: str = "globe", continent: str = "All") -> go.Figure:
+    """One trace per continent; the filter only flips `visible` on them."""
+    traces = []
+    for cont, color, lats, lons, sizes, hover, cdata in TRACE_DATA:
+        traces.append(dict(
+            type="scattergeo",
+            lat=lats,
+            lon=lons,
+            mode="markers",
+            marker=dict(
+                size=sizes,
+                color=color,
+                opacity=0.93,
+                line=dict(color="rgba(255,255,255,0.55)", width=1.5),
+            ),
+            name=CONTINENT_EMOJIS.get(cont, "") + "  " + cont,
+            hovertext=hover,
+            hoverinfo="text",
+            hoverlabel=dict(
+                bgcolor="rgba(3,12,28,0.97)",
+                bordercolor=color,
+                font=dict(color="#ddeeff", size=12, family="Exo 2"),
+                namelength=0,
+            ),
+            customdata=cdata,
+            visible=continent == "All" or cont == continent,
+            showlegend=True,
+        ))
 
     # ── Globe colours — fully transparent ocean so CSS starfield shows through ──
     geo = dict(
@@ -128,18 +265,9 @@ def build_figure(view_mode: str = "globe", continent: str = "All") -> go.Figure:
         resolution=50,
     )
 
-    if view_mode == "globe":
-        geo.update(
-            projection=dict(type="orthographic", rotation=dict(lon=15, lat=15, roll=0))
-        )
-    else:
-        geo.update(
-            projection=dict(type="natural earth"),
-            lataxis=dict(range=[-85, 85]),
-            lonaxis=dict(range=[-180, 180]),
-        )
+    geo.update(VIEW_GEO["globe" if view_mode == "globe" else "flat"])
 
-    fig.update_layout(
+    layout = dict(
         paper_bgcolor="rgba(0,0,0,0)",   # transparent → CSS starfield shows through
         plot_bgcolor="rgba(0,0,0,0)",
         geo=geo,
@@ -155,16 +283,20 @@ def build_figure(view_mode: str = "globe", continent: str = "All") -> go.Figure:
         margin=dict(l=0, r=0, t=0, b=0),
         uirevision=view_mode,
     )
-    return fig
+    # Plain dicts + no schema validation — every property here is fixed
+    return go.Figure(data=traces, layout=layout, skip_invalid=True, _validate=False)
+
+
+# Initial globe, built once at import — later view / filter changes are
+# clientside patches against this figure, so it is never rebuilt per session
+DEFAULT_FIGURE = build_figure("globe", "All").to_dict()
 
 
 # ─── Modal Charts ─────────────────────────────────────────────────────────────
 
 def build_pop_chart(city: dict) -> go.Figure:
-    cont_cities = sorted(
-        [c for c in CITIES_DATA if c["continent"] == city["continent"]],
-        key=lambda x: x["population"],
-    )
+    cont_cities = SORTED_BY_CONT[city["continent"]]
+    cols = POP_XY[city["continent"]]
     color = CONTINENT_COLORS.get(city["continent"], "#00d2ff")
     bar_colors = [
         color if c["name"] == city["name"] else "rgba(30,55,90,0.65)"
@@ -173,11 +305,11 @@ def build_pop_chart(city: dict) -> go.Figure:
 
     fig = go.Figure(
         go.Bar(
-            y=[c["name"] for c in cont_cities],
-            x=[c["population"] for c in cont_cities],
+            y=cols["names"],
+            x=cols["pops"],
             orientation="h",
             marker=dict(color=bar_colors, line=dict(width=0)),
-            text=[fmt_pop(c["population"]) for c in cont_cities],
+            text=cols["texts"],
             textposition="outside",
             textfont=dict(color="#8aafc8", size=10),
             hoverinfo="skip",
@@ -202,12 +334,10 @@ def build_pop_chart(city: dict) -> go.Figure:
 
 
 def build_attraction_chart(city: dict) -> go.Figure:
-    color = CONTINENT_COLORS.get(city["continent"], "#00d2ff")
     attrs = city["top_attractions"]
     short = [a[:22] + "…" if len(a) > 22 else a for a in attrs]
     scores = [95, 88, 80, 73, 65][: len(attrs)]
-    opacities = [0.95, 0.82, 0.70, 0.58, 0.46][: len(attrs)]
-    bar_colors = [hex_rgba(color, op) for op in opacities]
+    bar_colors = RGBA_RAMP[city["continent"]][: len(attrs)]
 
     fig = go.Figure(
         go.Bar(
@@ -244,13 +374,29 @@ def build_attraction_chart(city: dict) -> go.Figure:
     return fig
 
 
+@lru_cache(maxsize=256)
+def pop_chart_dict(city_idx: int) -> dict:
+    return build_pop_chart(CITIES_DATA[city_idx]).to_dict()
+
+
+@lru_cache(maxsize=256)
+def attraction_chart_dict(city_idx: int) -> dict:
+    return build_attraction_chart(CITIES_DATA[city_idx]).to_dict()
+
+
 # ─── CSV Helpers ──────────────────────────────────────────────────────────────
 
+def csv_field(value) -> str:
+    """Minimal-quoting CSV cell, matching csv.writer's default dialect."""
+    v = str(value)
+    if any(ch in v for ch in ',"\r\n'):
+        return '"' + v.replace('"', '""') + '"'
+    return v
+
+
 def city_to_csv(city: dict) -> str:
-    out = io.StringIO()
-    w = csv.writer(out)
-    w.writerow(["Field", "Value"])
-    w.writerows([
+    rows = [
+        ("Field",         "Value"),
         ("City",          city["name"]),
         ("Country",       city["country"]),
         ("Continent",     city["continent"]),
@@ -264,25 +410,38 @@ def city_to_csv(city: dict) -> str:
         ("Famous For",    city["best_known_for"]),
         ("Top Attractions", " | ".join(city["top_attractions"])),
         ("Fun Facts",     " | ".join(city.get("fun_facts", []))),
-    ])
-    return out.getvalue()
+    ]
+    return "".join(f"{csv_field(k)},{csv_field(v)}\r\n" for k, v in rows)
 
 
 def all_cities_csv() -> str:
-    out = io.StringIO()
-    w = csv.writer(out)
-    w.writerow([
-        "City", "Country", "Continent", "Population",
-        "Latitude", "Longitude", "Language", "Currency",
-        "Timezone", "Founded", "Famous For",
-    ])
-    for c in CITIES_DATA:
-        w.writerow([
+    rows = [
+        "City,Country,Continent,Population,Latitude,Longitude,Language,"
+        "Currency,Timezone,Founded,Famous For"
+    ]
+    rows.extend(
+        ",".join(csv_field(f) for f in (
             c["name"], c["country"], c["continent"], c["population"],
             c["lat"], c["lon"], c["language"], c["currency"],
             c["timezone"], c.get("founded", "Unknown"), c["best_known_for"],
-        ])
-    return out.getvalue()
+        ))
+        for c in CITIES_DATA
+    )
+    rows.append("")   # trailing line terminator, as csv.writer emits
+    return "\r\n".join(rows)
+
+
+# CITIES_DATA never changes — build every export once
+ALL_CITIES_DOWNLOAD = dict(content=all_cities_csv(), filename="world_cities_data.csv")
+CITY_CSV = [city_to_csv(c) for c in CITIES_DATA]
+CITY_CSV_FNAME = [c["name"].lower().replace(" ", "_") + "_data.csv" for c in CITIES_DATA]
+
+# dcc.Download payloads by city index — shipped to the browser once so the
+# per-city export never needs a server round-trip
+CITY_DOWNLOADS = [
+    dict(content=csv_text, filename=fname)
+    for csv_text, fname in zip(CITY_CSV, CITY_CSV_FNAME)
+]
 
 
 # ─── UI Building Blocks ───────────────────────────────────────────────────────
@@ -303,7 +462,6 @@ def stat_chip(icon: str, label: str, value: str) -> html.Div:
 
 def build_modal_body(city: dict) -> html.Div:
     color = CONTINENT_COLORS.get(city["continent"], "#00d2ff")
-    pop_pct = min(100, city["population"] / 22_000_000 * 100)
 
     return html.Div(
         [
@@ -338,9 +496,9 @@ def build_modal_body(city: dict) -> html.Div:
             # ── Tags ────────────────────────────────────────────────────
             html.Div(
                 [
-                    html.Span(t.strip(), className="tag",
+                    html.Span(t, className="tag",
                               style={"borderColor": color + "66"})
-                    for t in city["best_known_for"].split(",")
+                    for t in city["_tags"]
                 ],
                 className="tags-row",
             ),
@@ -356,7 +514,7 @@ def build_modal_body(city: dict) -> html.Div:
                     ),
                     html.Div(
                         html.Div(style={
-                            "width": f"{pop_pct:.0f}%", "height": "100%",
+                            "width": f"{city['_pop_pct']:.0f}%", "height": "100%",
                             "background": f"linear-gradient(90deg,{color}cc,{color}44)",
                             "borderRadius": "4px",
                             "transition": "width 1.2s cubic-bezier(0.4,0,0.2,1)",
@@ -370,7 +528,7 @@ def build_modal_body(city: dict) -> html.Div:
             # ── Stats chips ─────────────────────────────────────────────
             html.Div(
                 [
-                    stat_chip("👥", "Population", fmt_pop(city["population"])),
+                    stat_chip("👥", "Population", city["_fmt_pop"]),
                     stat_chip("🗣", "Language",   city["language"]),
                     stat_chip("💱", "Currency",   city["currency"]),
                     stat_chip("🕐", "Timezone",   city["timezone"]),
@@ -387,7 +545,7 @@ def build_modal_body(city: dict) -> html.Div:
                         [
                             html.P("Population Comparison", className="chart-title"),
                             dcc.Graph(
-                                figure=build_pop_chart(city),
+                                figure=pop_chart_dict(city["_idx"]),
                                 config={"displayModeBar": False},
                                 style={"height": "100%"},
                             ),
@@ -398,7 +556,7 @@ def build_modal_body(city: dict) -> html.Div:
                         [
                             html.P("Top Attraction Scores", className="chart-title"),
                             dcc.Graph(
-                                figure=build_attraction_chart(city),
+                                figure=attraction_chart_dict(city["_idx"]),
                                 config={"displayModeBar": False},
                                 style={"height": "100%"},
                             ),
@@ -442,6 +600,19 @@ def build_modal_body(city: dict) -> html.Div:
     )
 
 
+def modal_body(city_idx: int) -> html.Div:
+    """Memoised build_modal_body — the component tree is never mutated after."""
+    return build_modal_body(CITIES_DATA[city_idx])
+
+
+# SimpleCache is per-process and pickles on every hit, so only route through
+# Flask-Caching when a shared backend is configured; otherwise lru_cache
+if SHARED_CACHE:
+    modal_body = cache.memoize()(modal_body)
+else:
+    modal_body = lru_cache(maxsize=256)(modal_body)
+
+
 # ─── Layout ───────────────────────────────────────────────────────────────────
 
 CONTINENT_FILTER_OPTIONS = [
@@ -521,7 +692,7 @@ app.layout = html.Div(
         html.Div(
             dcc.Graph(
                 id="globe",
-                figure=build_figure(),
+                figure=DEFAULT_FIGURE,
                 responsive=True,
                 config={
                     "displayModeBar": True,
@@ -562,7 +733,10 @@ app.layout = html.Div(
 
         # ── Stores ───────────────────────────────────────────────────────────
         dcc.Store(id="view-store", data="globe"),
+        dcc.Store(id="view-geo",   data=VIEW_GEO),
+        dcc.Store(id="trace-order", data=TRACE_ORDER),
         dcc.Store(id="city-store", data=None),
+        dcc.Store(id="city-csv-store", data=CITY_DOWNLOADS),
     ],
     className="root",
 )
@@ -570,7 +744,8 @@ app.layout = html.Div(
 
 # ─── Callbacks ────────────────────────────────────────────────────────────────
 
-@app.callback(
+app.clientside_callback(
+    ClientsideFunction(namespace="globe", function_name="switchView"),
     Output("view-store", "data"),
     Output("btn-globe", "className"),
     Output("btn-map",   "className"),
@@ -578,67 +753,57 @@ app.layout = html.Div(
     Input("btn-map",   "n_clicks"),
     prevent_initial_call=True,
 )
-def switch_view(_gc, _mc):
-    if ctx.triggered_id == "btn-globe":
-        return "globe", "view-btn active", "view-btn"
-    return "flat", "view-btn", "view-btn active"
 
 
-@app.callback(
-    Output("globe", "figure"),
-    Input("view-store",       "data"),
+# View and continent changes are sent as Patch diffs against the figure already
+# in the browser (projection / trace visibility only) — see assets/globe.js
+app.clientside_callback(
+    ClientsideFunction(namespace="globe", function_name="setProjection"),
+    Output("globe", "figure", allow_duplicate=True),
+    Input("view-store", "data"),
+    State("view-geo",   "data"),
+    prevent_initial_call=True,
+)
+
+app.clientside_callback(
+    ClientsideFunction(namespace="globe", function_name="setContinent"),
+    Output("globe", "figure", allow_duplicate=True),
     Input("continent-filter", "value"),
+    State("trace-order",      "data"),
+    prevent_initial_call=True,
 )
-def refresh_globe(view, continent):
-    return build_figure(
-        view_mode=view or "globe",
-        continent=continent or "All",
-    )
 
 
 @app.callback(
     Output("city-store",   "data"),
     Output("city-modal",   "className"),
+    Output("modal-body",   "children"),
     Input("globe",         "clickData"),
     Input("close-modal-btn", "n_clicks"),
     prevent_initial_call=True,
 )
 def handle_click(click_data, _close):
+    # Open and fill the modal in the same round-trip
     if ctx.triggered_id == "close-modal-btn":
-        return no_update, "modal-overlay hidden"
+        return no_update, "modal-overlay hidden", no_update
 
     if ctx.triggered_id == "globe" and click_data:
         pts = click_data.get("points", [])
         if pts and "customdata" in pts[0]:
-            return pts[0]["customdata"], "modal-overlay visible"
-
-    return no_update, no_update
+            city_idx = pts[0]["customdata"]
+            return city_idx, "modal-overlay visible", modal_body(city_idx)
 
-
-@app.callback(
-    Output("modal-body", "children"),
-    Input("city-store",  "data"),
-    prevent_initial_call=True,
-)
-def update_modal(city_json):
-    if not city_json:
-        return html.Div()
-    city = json.loads(city_json) if isinstance(city_json, str) else city_json
-    return build_modal_body(city)
+    return no_update, no_update, no_update
 
 
-@app.callback(
+app.clientside_callback(
+    ClientsideFunction(namespace="globe", function_name="exportCity"),
     Output("download-city-csv", "data"),
     Input("export-city-btn",    "n_clicks"),
     State("city-store",         "data"),
+    State("city-csv-store",     "data"),
     prevent_initial_call=True,
 )
-def export_city(n, city_json):
-    if not n or not city_json:
-        return no_update
-    city = json.loads(city_json) if isinstance(city_json, str) else city_json
-    fname = city["name"].lower().replace(" ", "_") + "_data.csv"
-    return dict(content=city_to_csv(city), filename=fname)
 
 
 @app.callback(
@@ -649,7 +814,7 @@ def export_city(n, city_json):
 def export_all(n):
     if not n:
         return no_update
-    return dict(content=all_cities_csv(), filename="world_cities_data.csv")
+    return ALL_CITIES_DOWNLOAD
 
 
 # ─── Entry ────────────────────────────────────────────────────────────────────
@@ -0,0 +1,48 @@
+/* ╔══════════════════════════════════════════════════════════════════════╗
+   ║         World Globe Explorer — Clientside Callbacks                  ║
+   ╚══════════════════════════════════════════════════════════════════════╝ */
+
+window.dash_clientside = Object.assign({}, window.dash_clientside, {
+    globe: {
+        /* ─── View buttons — pick the mode and swap the active class ───── */
+        switchView: function (_gc, _mc) {
+            const triggered = window.dash_clientside.callback_context.triggered;
+            if (triggered[0].prop_id.split(".")[0] === "btn-globe") {
+                return ["globe", "view-btn active", "view-btn"];
+            }
+            return ["flat", "view-btn", "view-btn active"];
+        },
+
+        /* ─── View toggle — patch projection, leave traces untouched ───── */
+        setProjection: function (view, viewGeo) {
+            const mode = view === "flat" ? "flat" : "globe";
+            const patch = new dash_clientside.Patch()
+                .delete(["layout", "geo", "lataxis"])
+                .delete(["layout", "geo", "lonaxis"])
+                .assign(["layout", "uirevision"], mode);
+            Object.entries(viewGeo[mode]).forEach(function ([key, value]) {
+                patch.assign(["layout", "geo", key], value);
+            });
+            return patch.build();
+        },
+
+        /* ─── Continent filter — patch each trace's visible flag ──────── */
+        setContinent: function (continent, traceOrder) {
+            const cont = continent || "All";
+            const patch = new dash_clientside.Patch();
+            traceOrder.forEach(function (traceCont, i) {
+                patch.assign(["data", i, "visible"], cont === "All" || traceCont === cont);
+            });
+            return patch.build();
+        },
+
+        /* ─── City CSV export — serve the precomputed download payload ─── */
+        exportCity: function (n, cityIdx, downloads) {
+            if (!n || cityIdx === null || cityIdx === undefined) {
+                return window.dash_clientside.no_update;
+            }
+            // fresh object — dcc.Download ignores data identical to the last one
+            return Object.assign({}, downloads[cityIdx]);
+        },
+    },
+});